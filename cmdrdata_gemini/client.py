@@ -97,15 +97,27 @@ class TrackedGemini:
         # Initialize tracked attributes cache
         self._tracked_attributes = {}
 
+        # Build the tracked sub-clients (e.g. client.models) once and bind
+        # them as real attributes, so they never go through __getattr__
+        if self._track_usage and self._tracker:
+            for name, track_methods in GEMINI_TRACK_METHODS.items():
+                sub_client = getattr(self._original_client, name, None)
+                if sub_client is not None:
+                    object.__setattr__(
+                        self,
+                        name,
+                        TrackedProxy(sub_client, self._tracker, track_methods),
+                    )
+
         # Performance monitoring
         self._performance = PerformanceContext("gemini_client")
 
     def __getattr__(self, name: str) -> Any:
         """
         Dynamically forward attribute access to the underlying client.
-        If the attribute should be tracked, wrap it with the proxy.
+        Tracked sub-clients are bound at init time and never reach here.
         """
-        # Check if we've already wrapped this attribute
+        # Check if we've already looked up this attribute
         if name in self._tracked_attributes:
             return self._tracked_attributes[name]
 
@@ -117,23 +129,6 @@ class TrackedGemini:
                 f"'{type(self._original_client).__name__}' object has no attribute '{name}'"
             )
 
-        # If tracking is enabled and this attribute should be tracked, wrap it
-        if self._track_usage and self._tracker:
-            # Check if this attribute or any sub-attributes should be tracked
-            relevant_track_methods = {}
-            for k, v in GEMINI_TRACK_METHODS.items():
-                if k == name:
-                    relevant_track_methods[k] = v
-                elif k.startswith(f"{name}."):
-                    # Strip the prefix for nested methods
-                    relevant_track_methods[k[len(name) + 1 :]] = v
-
-            if relevant_track_methods:
-                wrapped_attr = TrackedProxy(attr, self._tracker, relevant_track_methods)
-                self._tracked_attributes[name] = wrapped_attr
-                return wrapped_attr
-
-        # For everything else, just return the original attribute
         self._tracked_attributes[name] = attr
         return attr
 
@@ -2,30 +2,150 @@
 Dynamic proxy classes for transparent API forwarding with usage tracking
 """
 
-import inspect
+import functools
+import itertools
 import logging
+import os
+import secrets
+import sys
 import time
-import uuid
+import weakref
 from datetime import datetime
-from typing import Any, Callable, Dict, Optional, Union
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Mapping, Optional, Tuple, Union
 
 from .context import get_effective_customer_id
 from .tracker import UsageTracker
 
 logger = logging.getLogger(__name__)
 
+# Sentinel for attributes that are absent, as opposed to set to None
+_MISSING = object()
+
+# Metadata for count_tokens calls without a token total, shared read-only
+# between calls (track_usage_background copies metadata before extending it)
+_COUNT_TOKENS_METADATA = MappingProxyType({"operation": "count_tokens"})
+
+# Tracking runs on the tracker's worker after the call has returned, so list
+# and dict arguments are copied first in case the caller reuses them
+_SNAPSHOT_TYPES = (list, dict)
+
+# Request IDs are only used to correlate events, so a random per-process
+# prefix plus a counter is enough and avoids an os.urandom() call per request
+_request_id_prefix = secrets.token_hex(8)
+_request_id_counter = itertools.count()
+
+
+def _reset_request_ids() -> None:
+    """Give a forked child its own request ID prefix and counter"""
+    global _request_id_prefix, _request_id_counter
+    _request_id_prefix = secrets.token_hex(8)
+    _request_id_counter = itertools.count()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_request_ids)
+
+
+# Exception classes seen by the tracked wrapper whose instances have no
+# "code" attribute at all, so repeated errors of that class skip the probe
+_ERROR_CLASSES_WITHOUT_CODE: "weakref.WeakKeyDictionary[type, bool]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _classify_error(error: Exception) -> Tuple[str, Optional[str]]:
+    """
+    Return the (error_type, error_code) to track for an exception.
+
+    gRPC errors expose a code() method; google-genai's APIError stores the
+    HTTP status in a plain code attribute.
+    """
+    error_class = type(error)
+    if error_class in _ERROR_CLASSES_WITHOUT_CODE:
+        return "sdk_error", None
+
+    code = getattr(error, "code", _MISSING)
+    if code is _MISSING:
+        _ERROR_CLASSES_WITHOUT_CODE[error_class] = True
+        return "sdk_error", None
+    # Classes like APIError always set code but may set it to None, so only
+    # a missing attribute says anything about the class
+    if code is None:
+        return "sdk_error", None
+
+    if callable(code):  # Heuristic for gRPC error
+        try:
+            return "grpc_error", str(code())
+        except Exception:
+            return "sdk_error", None
+
+    return "sdk_error", str(code)
+
+
+def _compile_track_methods(track_methods: Mapping[str, Any]) -> Mapping[str, Any]:
+    """
+    Parse dotted method paths into a read-only nested mapping, e.g.
+    {"models.generate_content": f} -> {"models": {"generate_content": f}}
+
+    Values that are already nested mappings are merged in as subtrees.
+    """
+    return _freeze_track_tree(_build_track_tree(track_methods))
+
+
+def _build_track_tree(track_methods: Mapping[str, Any]) -> Dict[str, Any]:
+    tree: Dict[str, Any] = {}
+    for path, value in track_methods.items():
+        # Interned so attribute names compare by identity in lookups
+        *parents, leaf = map(sys.intern, path.split("."))
+        node = tree
+        for part in parents:
+            node = node.setdefault(part, {})
+        if isinstance(value, Mapping):
+            node.setdefault(leaf, {}).update(_build_track_tree(value))
+        else:
+            node[leaf] = value
+    return tree
+
+
+def _freeze_track_tree(tree: Dict[str, Any]) -> Mapping[str, Any]:
+    return MappingProxyType(
+        {
+            name: _freeze_track_tree(node) if isinstance(node, dict) else node
+            for name, node in tree.items()
+        }
+    )
+
 
 class TrackedProxy:
     """
     Base proxy class that forwards all method calls to the underlying client
     while selectively adding usage tracking to specific methods.
+
+    Instantiating TrackedProxy with tracked methods returns an instance of a
+    generated subclass specialised for that set of top-level names (see
+    _proxy_class), so tracked attributes resolve through class-level slots.
     """
 
+    __slots__ = ("_client", "_tracker", "_track_tree", "_dir_cache")
+
+    def __new__(
+        cls,
+        client: Any,
+        tracker: UsageTracker,
+        track_methods: Mapping[str, Any] = None,
+    ):
+        if cls is TrackedProxy and track_methods:
+            cls = _proxy_class(
+                tuple(sorted({path.split(".", 1)[0] for path in track_methods}))
+            )
+        return super().__new__(cls)
+
     def __init__(
         self,
         client: Any,
         tracker: UsageTracker,
-        track_methods: Dict[str, Callable] = None,
+        track_methods: Mapping[str, Any] = None,
     ):
         """
         Initialize the proxy.
@@ -33,160 +153,177 @@ class TrackedProxy:
         Args:
             client: The underlying client (e.g., Google Gen AI client)
             tracker: Usage tracker instance
-            track_methods: Dict mapping method names to tracking functions
+            track_methods: Mapping of method names (dotted paths such as
+                "models.generate_content", or nested mappings for sub-clients)
+                to tracking functions.
+                Tracking functions are called positionally with the same
+                parameters, in the same order, as track_generate_content;
+                raw_model is the call's "model" keyword argument, if any.
         """
         # Store these with underscore prefixes to avoid conflicts
-        object.__setattr__(self, "_client", client)
-        object.__setattr__(self, "_tracker", tracker)
-        object.__setattr__(self, "_track_methods", track_methods or {})
-        object.__setattr__(self, "_tracked_attributes", {})
+        self._client = client
+        self._tracker = tracker
+        self._track_tree = _compile_track_methods(track_methods or {})
+        self._dir_cache = None
+
+        # Wrap tracked methods and build sub-proxies up front and store them in
+        # their slots, so tracked lookups never reach __getattr__
+        for name, node in self._track_tree.items():
+            attr = getattr(client, name, None)
+            if isinstance(node, Mapping):
+                # This might be a sub-client (like client.models)
+                if hasattr(attr, "__dict__") and not isinstance(
+                    attr, (str, int, float, bool, type(None))
+                ):
+                    setattr(self, name, TrackedProxy(attr, self._tracker, node))
+            elif callable(attr):
+                setattr(self, name, self._wrap_method(attr, name, node))
 
     def __getattr__(self, name: str) -> Any:
         """
-        Dynamically forward attribute access to the underlying client.
-        If the attribute is a method that should be tracked, wrap it.
-        """
-        # Check if we've already wrapped this attribute
-        if name in self._tracked_attributes:
-            return self._tracked_attributes[name]
+        Forward attribute access to the underlying client.
 
-        # Get the attribute from the underlying client
+        Only reached for attributes that are not tracked, since tracked
+        methods and sub-proxies are bound on the instance at init time.
+        """
         try:
-            attr = getattr(self._client, name)
+            return getattr(self._client, name)
         except AttributeError:
-            # Don't cache non-existent attributes
             raise AttributeError(
                 f"'{type(self._client).__name__}' object has no attribute '{name}'"
             )
 
-        # If it's a callable and we have a tracker for it, wrap it
-        if callable(attr) and name in self._track_methods:
-            wrapped_attr = self._wrap_method(attr, name)
-            self._tracked_attributes[name] = wrapped_attr
-            return wrapped_attr
-
-        # If it's another object that might need proxying, check if we should wrap it
-        elif hasattr(attr, "__dict__") and not isinstance(
-            attr, (str, int, float, bool, type(None))
-        ):
-            # This might be a sub-client (like client.models)
-            # Check if any of our track methods start with this attribute name
-            sub_track_methods = {
-                k[len(name) + 1 :]: v
-                for k, v in self._track_methods.items()
-                if k.startswith(f"{name}.")
-            }
-
-            if sub_track_methods:
-                wrapped_attr = TrackedProxy(attr, self._tracker, sub_track_methods)
-                self._tracked_attributes[name] = wrapped_attr
-                return wrapped_attr
-
-        # For everything else, just return the original attribute
-        self._tracked_attributes[name] = attr
-        return attr
-
-    def __setattr__(self, name: str, value: Any) -> None:
-        """Forward attribute setting to the underlying client"""
-        if name.startswith("_"):
-            object.__setattr__(self, name, value)
-        else:
-            setattr(self._client, name, value)
-
     def __dir__(self):
         """Return attributes from both proxy and underlying client"""
-        proxy_attrs = [
-            attr for attr in object.__dir__(self) if not attr.startswith("_")
-        ]
-        client_attrs = dir(self._client)
-        return sorted(set(proxy_attrs + client_attrs))
-
-    def _wrap_method(self, method: Callable, method_name: str) -> Callable:
+        # Cached per client object, since IDEs and REPL completion call this
+        # often; it is rebuilt if _client is replaced
+        cache = self._dir_cache
+        if cache is None or cache[0] is not self._client:
+            proxy_attrs = [
+                attr for attr in object.__dir__(self) if not attr.startswith("_")
+            ]
+            client_attrs = dir(self._client)
+            cache = (self._client, sorted(set(proxy_attrs + client_attrs)))
+            self._dir_cache = cache
+        return list(cache[1])
+
+    def _wrap_method(
+        self, method: Callable, method_name: str, tracker_func: Callable
+    ) -> Callable:
         """Wrap a method to add usage tracking and performance monitoring"""
-        tracker_func = self._track_methods[method_name]
+        # Resolve everything that is invariant per wrapped method once, so the
+        # per-call path only touches closure locals
+        tracker = self._tracker
+        submit_tracking = tracker.submit_tracking
+        wall_clock = time.time
+        perf_counter_ns = time.perf_counter_ns
+        log_warning = logger.warning
+        classify_error = _classify_error
+
+        def emit(
+            result,
+            customer_id,
+            args,
+            kwargs,
+            custom_metadata,
+            start_time,
+            end_time,
+            request_id,
+            error_type=None,
+            error_code=None,
+            error_message=None,
+        ):
+            """Queue a finished request for the tracking function, never raising"""
+            try:
+                for key, value in kwargs.items():
+                    if isinstance(value, _SNAPSHOT_TYPES):
+                        kwargs[key] = value.copy()
+                if custom_metadata:
+                    custom_metadata = dict(custom_metadata)
+
+                # The customer context lives in a contextvar, so it has to be
+                # resolved here rather than on the tracker's worker thread
+                submit_tracking(
+                    tracker_func,
+                    result,
+                    get_effective_customer_id(customer_id),
+                    tracker,
+                    method_name,
+                    args,
+                    kwargs,
+                    custom_metadata,
+                    start_time,
+                    end_time,
+                    error_type is not None,
+                    error_type,
+                    error_code,
+                    error_message,
+                    request_id,
+                    kwargs.get("model"),
+                )
+            except Exception as e:
+                log_warning("Failed to track usage for %s: %s", method_name, e)
 
         def wrapped(*args, **kwargs):
-            customer_id = kwargs.pop("customer_id", ...)
-            track_usage = kwargs.pop("track_usage", True)
-            custom_metadata = kwargs.pop("metadata", None)
-
-            request_id = str(uuid.uuid4())
-            start_time = time.time()
-            error_occurred = False
-            error_type = None
-            error_code = None
-            error_message = None
+            # ... is the "not passed" sentinel understood by
+            # get_effective_customer_id
+            if kwargs:
+                customer_id = kwargs.pop("customer_id", ...)
+                track_usage = kwargs.pop("track_usage", True)
+                custom_metadata = kwargs.pop("metadata", None)
+            else:
+                customer_id = ...
+                track_usage = True
+                custom_metadata = None
+
+            if not track_usage:
+                return method(*args, **kwargs)
+
+            request_id = f"{_request_id_prefix}{next(_request_id_counter):x}"
+            # Measure the duration on the monotonic clock and derive the end
+            # time from it, so wall clock adjustments can't skew durations
+            start_time = wall_clock()
+            start_ns = perf_counter_ns()
 
             try:
                 result = method(*args, **kwargs)
-                end_time = time.time()
-
-                if track_usage:
-                    try:
-                        tracker_func(
-                            result=result,
-                            customer_id=customer_id,
-                            tracker=self._tracker,
-                            method_name=method_name,
-                            args=args,
-                            kwargs=kwargs,
-                            custom_metadata=custom_metadata,
-                            request_start_time=start_time,
-                            request_end_time=end_time,
-                            error_occurred=error_occurred,
-                            error_type=error_type,
-                            error_code=error_code,
-                            error_message=error_message,
-                            request_id=request_id,
-                        )
-                    except Exception as e:
-                        logger.warning(f"Failed to track usage for {method_name}: {e}")
-
-                return result
-
             except Exception as e:
-                end_time = time.time()
-                error_occurred = True
-                error_message = str(e)
-
-                # Google's SDK uses grpc, so we inspect the exception differently
-                if hasattr(e, "code"):  # Heuristic for gRPC error
-                    error_code = str(e.code())
-                    error_type = "grpc_error"
-                else:
-                    error_type = "sdk_error"
-
-                if track_usage:
-                    try:
-                        tracker_func(
-                            result=None,
-                            customer_id=customer_id,
-                            tracker=self._tracker,
-                            method_name=method_name,
-                            args=args,
-                            kwargs=kwargs,
-                            custom_metadata=custom_metadata,
-                            request_start_time=start_time,
-                            request_end_time=end_time,
-                            error_occurred=error_occurred,
-                            error_type=error_type,
-                            error_code=error_code,
-                            error_message=error_message,
-                            request_id=request_id,
-                        )
-                    except Exception as track_error:
-                        logger.warning(
-                            f"Failed to track error for {method_name}: {track_error}"
-                        )
-
+                end_time = start_time + (perf_counter_ns() - start_ns) / 1e9
+
+                error_type, error_code = classify_error(e)
+
+                emit(
+                    None,
+                    customer_id,
+                    args,
+                    kwargs,
+                    custom_metadata,
+                    start_time,
+                    end_time,
+                    request_id,
+                    error_type,
+                    error_code,
+                    str(e),
+                )
                 raise
 
+            emit(
+                result,
+                customer_id,
+                args,
+                kwargs,
+                custom_metadata,
+                start_time,
+                start_time + (perf_counter_ns() - start_ns) / 1e9,
+                request_id,
+            )
+            return result
+
         wrapped.__name__ = getattr(method, "__name__", method_name)
         wrapped.__doc__ = getattr(method, "__doc__", None)
-        try:
-            wrapped.__signature__ = inspect.signature(method)
-        except (ValueError, TypeError):
-            pass
+        # inspect.signature() follows __wrapped__, so the signature is only
+        # computed if someone actually asks for it
+        wrapped.__wrapped__ = method
 
         return wrapped
 
@@ -195,6 +332,48 @@ class TrackedProxy:
         return f"TrackedProxy({repr(self._client)})"
 
 
+@functools.lru_cache(maxsize=32)
+def _normalize_model(model: str) -> str:
+    """
+    Strip the "models/" resource prefix from a model name.
+
+    Applications reuse a handful of model names, so this is cached.
+    """
+    return model[7:] if model.startswith("models/") else model
+
+
+@functools.lru_cache(maxsize=None)
+def _proxy_class(tracked_names: Tuple[str, ...]) -> type:
+    """
+    Return a TrackedProxy subclass with one slot per tracked attribute name.
+
+    The wrapped methods and sub-proxies bound in __init__ then live in slots
+    whose descriptors sit on the class, so lookups are served by CPython's
+    type attribute cache instead of an instance dict probe. Classes are
+    cached per shape, so e.g. every proxy of client.models shares one class.
+
+    Names that aren't identifiers (e.g. "models-v2") can't be slots and are
+    kept in an instance dict instead. Names that clash with the proxy's own
+    attributes are rejected, since binding them would clobber its state.
+    """
+    reserved = [name for name in tracked_names if hasattr(TrackedProxy, name)]
+    if reserved:
+        raise ValueError(
+            f"Tracked method names clash with TrackedProxy attributes: "
+            f"{', '.join(reserved)}"
+        )
+
+    slots = tuple(name for name in tracked_names if name.isidentifier())
+    if len(slots) < len(tracked_names):
+        slots += ("__dict__",)
+
+    return type(
+        "TrackedProxy",
+        (TrackedProxy,),
+        {"__slots__": slots, "__module__": __name__},
+    )
+
+
 def track_generate_content(
     result,
     customer_id,
@@ -211,6 +390,7 @@ def track_generate_content(
     error_code=None,
     error_message=None,
     request_id=None,
+    raw_model=None,
 ):
     """Track Google Gen AI generate_content usage"""
     try:
@@ -218,28 +398,34 @@ def track_generate_content(
 
         input_tokens = 0
         output_tokens = 0
-        model = kwargs.get("model", "unknown")
-        if isinstance(model, str) and model.startswith("models/"):
-            model = model[7:]
-
-        metadata = {}
-        if result and hasattr(result, "usage_metadata"):
-            input_tokens = getattr(result.usage_metadata, "prompt_token_count", 0)
-            output_tokens = getattr(result.usage_metadata, "candidates_token_count", 0)
-            metadata.update(
-                {
-                    "response_id": getattr(result, "id", None),
-                    "safety_ratings": getattr(result, "safety_ratings", None),
-                    "finish_reason": (
-                        getattr(result.candidates[0], "finish_reason", None)
-                        if hasattr(result, "candidates") and result.candidates
-                        else None
-                    ),
-                }
-            )
-        elif not error_occurred:
-            # No usage data available and no error, skip tracking
-            return
+        model = raw_model if raw_model is not None else kwargs.get("model", "unknown")
+        if isinstance(model, str):
+            model = _normalize_model(model)
+
+        # Straight-line extraction for the common response shape; only the
+        # candidates list, the most variable part, needs exception handling
+        usage_metadata = getattr(result, "usage_metadata", _MISSING)
+        if usage_metadata is _MISSING:
+            if not error_occurred:
+                # No usage data available and no error, skip tracking
+                return
+            metadata = {}
+        else:
+            # Token counts are optional fields and may be None
+            input_tokens = getattr(usage_metadata, "prompt_token_count", 0) or 0
+            output_tokens = getattr(usage_metadata, "candidates_token_count", 0) or 0
+
+            try:
+                candidates = getattr(result, "candidates", None)
+                finish_reason = candidates[0].finish_reason if candidates else None
+            except (AttributeError, IndexError):
+                finish_reason = None
+
+            metadata = {
+                "response_id": getattr(result, "id", None),
+                "safety_ratings": getattr(result, "safety_ratings", None),
+                "finish_reason": finish_reason,
+            }
 
         if custom_metadata:
             metadata.update(custom_metadata)
@@ -261,7 +447,7 @@ def track_generate_content(
         )
 
     except Exception as e:
-        logger.warning(f"Failed to extract usage data from generate_content: {e}")
+        logger.warning("Failed to extract usage data from generate_content: %s", e)
 
 
 def track_count_tokens(
@@ -280,23 +466,26 @@ def track_count_tokens(
     error_code=None,
     error_message=None,
     request_id=None,
+    raw_model=None,
 ):
     """Track Google Gen AI count_tokens usage"""
     try:
         effective_customer_id = get_effective_customer_id(customer_id)
 
         input_tokens = 0
-        model = kwargs.get("model", "unknown")
-        if isinstance(model, str) and model.startswith("models/"):
-            model = model[7:]
+        model = raw_model if raw_model is not None else kwargs.get("model", "unknown")
+        if isinstance(model, str):
+            model = _normalize_model(model)
 
-        metadata = {"operation": "count_tokens"}
         if result and hasattr(result, "total_tokens"):
             input_tokens = result.total_tokens
-            metadata["total_tokens"] = result.total_tokens
-
-        if custom_metadata:
-            metadata.update(custom_metadata)
+            metadata = {"operation": "count_tokens", "total_tokens": input_tokens}
+            if custom_metadata:
+                metadata.update(custom_metadata)
+        elif custom_metadata:
+            metadata = {"operation": "count_tokens", **custom_metadata}
+        else:
+            metadata = _COUNT_TOKENS_METADATA
 
         tracker.track_usage_background(
             customer_id=effective_customer_id,
@@ -315,7 +504,7 @@ def track_count_tokens(
         )
 
     except Exception as e:
-        logger.warning(f"Failed to extract usage data from count_tokens: {e}")
+        logger.warning("Failed to extract usage data from count_tokens: %s", e)
 
 
 def track_embed_content(
@@ -326,7 +515,15 @@ def track_embed_content(
     args,
     kwargs,
     custom_metadata=None,
-    **tracking_params,
+    # Enhanced tracking parameters
+    request_start_time=None,
+    request_end_time=None,
+    error_occurred=None,
+    error_type=None,
+    error_code=None,
+    error_message=None,
+    request_id=None,
+    raw_model=None,
 ):
     """Track Gemini embeddings generation"""
     try:
@@ -337,9 +534,9 @@ def track_embed_content(
 
         # Embeddings don't typically report token usage like text generation
         # But we track the operation for billing and analytics
-        model = kwargs.get("model", "unknown")
-        if isinstance(model, str) and model.startswith("models/"):
-            model = model[7:]
+        model = raw_model if raw_model is not None else kwargs.get("model", "unknown")
+        if isinstance(model, str):
+            model = _normalize_model(model)
 
         metadata = {
             "operation": "embed_content",
@@ -364,10 +561,16 @@ def track_embed_content(
             output_tokens=0,  # Embeddings don't have output tokens
             provider="google",
             metadata=metadata,
-            **tracking_params,
+            request_start_time=request_start_time,
+            request_end_time=request_end_time,
+            error_occurred=error_occurred,
+            error_type=error_type,
+            error_code=error_code,
+            error_message=error_message,
+            request_id=request_id,
         )
     except Exception as e:
-        logger.warning(f"Failed to track embeddings: {e}")
+        logger.warning("Failed to track embeddings: %s", e)
 
 
 def track_batch_embed_contents(
@@ -378,7 +581,15 @@ def track_batch_embed_contents(
     args,
     kwargs,
     custom_metadata=None,
-    **tracking_params,
+    # Enhanced tracking parameters
+    request_start_time=None,
+    request_end_time=None,
+    error_occurred=None,
+    error_type=None,
+    error_code=None,
+    error_message=None,
+    request_id=None,
+    raw_model=None,
 ):
     """Track Gemini batch embeddings generation"""
     try:
@@ -387,9 +598,9 @@ def track_batch_embed_contents(
             logger.warning("No customer_id provided for batch embeddings tracking")
             return
 
-        model = kwargs.get("model", "unknown")
-        if isinstance(model, str) and model.startswith("models/"):
-            model = model[7:]
+        model = raw_model if raw_model is not None else kwargs.get("model", "unknown")
+        if isinstance(model, str):
+            model = _normalize_model(model)
 
         requests = kwargs.get("requests", [])
         content_count = len(requests)
@@ -417,10 +628,16 @@ def track_batch_embed_contents(
             output_tokens=0,
             provider="google",
             metadata=metadata,
-            **tracking_params,
+            request_start_time=request_start_time,
+            request_end_time=request_end_time,
+            error_occurred=error_occurred,
+            error_type=error_type,
+            error_code=error_code,
+            error_message=error_message,
+            request_id=request_id,
         )
     except Exception as e:
-        logger.warning(f"Failed to track batch embeddings: {e}")
+        logger.warning("Failed to track batch embeddings: %s", e)
 
 
 def track_classify_text(
@@ -431,7 +648,15 @@ def track_classify_text(
     args,
     kwargs,
     custom_metadata=None,
-    **tracking_params,
+    # Enhanced tracking parameters
+    request_start_time=None,
+    request_end_time=None,
+    error_occurred=None,
+    error_type=None,
+    error_code=None,
+    error_message=None,
+    request_id=None,
+    raw_model=None,
 ):
     """Track Gemini text classification"""
     try:
@@ -440,9 +665,9 @@ def track_classify_text(
             logger.warning("No customer_id provided for text classification tracking")
             return
 
-        model = kwargs.get("model", "unknown")
-        if isinstance(model, str) and model.startswith("models/"):
-            model = model[7:]
+        model = raw_model if raw_model is not None else kwargs.get("model", "unknown")
+        if isinstance(model, str):
+            model = _normalize_model(model)
 
         text_content = kwargs.get("text", "")
         metadata = {
@@ -470,10 +695,16 @@ def track_classify_text(
             output_tokens=0,  # Classification typically doesn't generate text
             provider="google",
             metadata=metadata,
-            **tracking_params,
+            request_start_time=request_start_time,
+            request_end_time=request_end_time,
+            error_occurred=error_occurred,
+            error_type=error_type,
+            error_code=error_code,
+            error_message=error_message,
+            request_id=request_id,
         )
     except Exception as e:
-        logger.warning(f"Failed to track text classification: {e}")
+        logger.warning("Failed to track text classification: %s", e)
 
 
 def track_batch_generate_content(
@@ -484,7 +715,15 @@ def track_batch_generate_content(
     args,
     kwargs,
     custom_metadata=None,
-    **tracking_params,
+    # Enhanced tracking parameters
+    request_start_time=None,
+    request_end_time=None,
+    error_occurred=None,
+    error_type=None,
+    error_code=None,
+    error_message=None,
+    request_id=None,
+    raw_model=None,
 ):
     """Track Gemini batch content generation"""
     try:
@@ -495,9 +734,9 @@ def track_batch_generate_content(
             )
             return
 
-        model = kwargs.get("model", "unknown")
-        if isinstance(model, str) and model.startswith("models/"):
-            model = model[7:]
+        model = raw_model if raw_model is not None else kwargs.get("model", "unknown")
+        if isinstance(model, str):
+            model = _normalize_model(model)
 
         requests = kwargs.get("requests", [])
         batch_size = len(requests)
@@ -532,10 +771,16 @@ def track_batch_generate_content(
             output_tokens=total_output_tokens,
             provider="google",
             metadata=metadata,
-            **tracking_params,
+            request_start_time=request_start_time,
+            request_end_time=request_end_time,
+            error_occurred=error_occurred,
+            error_type=error_type,
+            error_code=error_code,
+            error_message=error_message,
+            request_id=request_id,
         )
     except Exception as e:
-        logger.warning(f"Failed to track batch content generation: {e}")
+        logger.warning("Failed to track batch content generation: %s", e)
 
 
 def track_start_chat(
@@ -546,7 +791,15 @@ def track_start_chat(
     args,
     kwargs,
     custom_metadata=None,
-    **tracking_params,
+    # Enhanced tracking parameters
+    request_start_time=None,
+    request_end_time=None,
+    error_occurred=None,
+    error_type=None,
+    error_code=None,
+    error_message=None,
+    request_id=None,
+    raw_model=None,
 ):
     """Track Gemini chat session creation"""
     try:
@@ -555,9 +808,9 @@ def track_start_chat(
             logger.warning("No customer_id provided for chat session tracking")
             return
 
-        model = kwargs.get("model", "unknown")
-        if isinstance(model, str) and model.startswith("models/"):
-            model = model[7:]
+        model = raw_model if raw_model is not None else kwargs.get("model", "unknown")
+        if isinstance(model, str):
+            model = _normalize_model(model)
 
         history = kwargs.get("history", [])
         metadata = {
@@ -581,25 +834,37 @@ def track_start_chat(
             output_tokens=0,
             provider="google",
             metadata=metadata,
-            **tracking_params,
+            request_start_time=request_start_time,
+            request_end_time=request_end_time,
+            error_occurred=error_occurred,
+            error_type=error_type,
+            error_code=error_code,
+            error_message=error_message,
+            request_id=request_id,
         )
     except Exception as e:
-        logger.warning(f"Failed to track chat session creation: {e}")
+        logger.warning("Failed to track chat session creation: %s", e)
 
 
 # Google Gen AI tracking configuration - All methods that consume tokens or should be tracked
-GEMINI_TRACK_METHODS = {
-    # Text Generation
-    "models.generate_content": track_generate_content,
-    # Batch Generation
-    "models.batch_generate_content": track_batch_generate_content,
-    # Embeddings
-    "models.embed_content": track_embed_content,
-    "models.batch_embed_contents": track_batch_embed_contents,
-    # Classification
-    "models.classify_text": track_classify_text,
-    # Chat Sessions
-    "models.start_chat": track_start_chat,
-    # Token Counting
-    "models.count_tokens": track_count_tokens,
-}
+GEMINI_TRACK_METHODS = MappingProxyType(
+    {
+        "models": MappingProxyType(
+            {
+                # Text Generation
+                "generate_content": track_generate_content,
+                # Batch Generation
+                "batch_generate_content": track_batch_generate_content,
+                # Embeddings
+                "embed_content": track_embed_content,
+                "batch_embed_contents": track_batch_embed_contents,
+                # Classification
+                "classify_text": track_classify_text,
+                # Chat Sessions
+                "start_chat": track_start_chat,
+                # Token Counting
+                "count_tokens": track_count_tokens,
+            }
+        ),
+    }
+)
@@ -3,10 +3,16 @@ Usage tracking client for sending events to cmdrdata backend
 """
 
 import asyncio
+import atexit
 import logging
+import os
+import queue
+import threading
+import time
+import weakref
 from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Optional
 
 try:
     import httpx
@@ -26,6 +32,15 @@ from .security import APIKeyManager, InputSanitizer
 
 logger = get_logger(__name__)
 
+# Upper bound on how long interpreter exit waits for queued tracking calls
+_EXIT_DRAIN_TIMEOUT = 5.0
+
+# Running tracking workers and their queues, drained at interpreter exit
+_tracking_workers: Dict[threading.Thread, "queue.Queue"] = {}
+
+# Live trackers, so a forked child can give each one a fresh worker
+_trackers: "weakref.WeakSet[UsageTracker]" = weakref.WeakSet()
+
 
 class UsageTracker:
     """
@@ -40,6 +55,7 @@ class UsageTracker:
         endpoint: str = "https://api.cmdrdata.ai/api/events",
         timeout: float = 5.0,
         max_retries: int = 3,
+        max_pending_events: int = 1000,
     ):
         """
         Initialize the usage tracker.
@@ -49,6 +65,8 @@ class UsageTracker:
             endpoint: cmdrdata API endpoint URL
             timeout: Request timeout in seconds
             max_retries: Maximum number of retry attempts
+            max_pending_events: Maximum number of queued tracking calls before
+                new ones are dropped
         """
         # Validate inputs
         if not api_key or not isinstance(api_key, str) or api_key.strip() == "":
@@ -88,6 +106,70 @@ class UsageTracker:
         # Thread pool for async usage tracking in sync contexts
         self._executor = ThreadPoolExecutor(max_workers=2)
 
+        # Tracking calls submitted by proxies run on a single worker thread,
+        # started on first use, so usage extraction stays off the caller's path
+        self._extract_queue: "queue.Queue" = queue.Queue(maxsize=max_pending_events)
+        self._extract_worker: Optional[threading.Thread] = None
+        self._extract_worker_lock = threading.Lock()
+        # Events dropped since the queue last had room, logged once per run
+        self._dropped_events = 0
+        _trackers.add(self)
+
+    def submit_tracking(self, func: Callable[..., Any], *args: Any) -> None:
+        """
+        Run a tracking function on the background worker thread.
+
+        Never blocks the caller: if the queue is full the call is dropped.
+
+        Args:
+            func: Tracking function to call
+            *args: Positional arguments for the tracking function
+        """
+        if self._extract_worker is None:
+            self._start_extract_worker()
+
+        try:
+            self._extract_queue.put_nowait((func, args))
+        except queue.Full:
+            self._dropped_events += 1
+            if self._dropped_events == 1:
+                logger.warning("Usage tracking queue is full, dropping events")
+            return
+
+        if self._dropped_events:
+            logger.warning(
+                "Usage tracking queue has room again, %d events were dropped",
+                self._dropped_events,
+            )
+            self._dropped_events = 0
+
+    def flush(self) -> None:
+        """Block until every submitted tracking call has run"""
+        self._extract_queue.join()
+
+    def _start_extract_worker(self) -> None:
+        """Start the tracking worker thread if it isn't running yet"""
+        with self._extract_worker_lock:
+            if self._extract_worker is None:
+                # The worker only holds the queue, not the tracker, so the
+                # tracker can still be garbage collected
+                worker = threading.Thread(
+                    target=_run_tracking_worker,
+                    args=(self._extract_queue,),
+                    name="cmdrdata-tracking",
+                    daemon=True,
+                )
+                _tracking_workers[worker] = self._extract_queue
+                worker.start()
+                self._extract_worker = worker
+
+    def _reset_extract_worker(self) -> None:
+        """Drop the worker state inherited from a parent process"""
+        self._extract_queue = queue.Queue(maxsize=self._extract_queue.maxsize)
+        self._extract_worker = None
+        self._extract_worker_lock = threading.Lock()
+        self._dropped_events = 0
+
     def track_usage(
         self,
         customer_id: str,
@@ -396,6 +478,66 @@ class UsageTracker:
         }
 
     def __del__(self):
-        """Cleanup thread pool on deletion."""
+        """Cleanup thread pool and tracking worker on deletion."""
         if hasattr(self, "_executor"):
             self._executor.shutdown(wait=False)
+        if getattr(self, "_extract_worker", None) is not None:
+            try:
+                self._extract_queue.put_nowait(None)
+            except queue.Full:
+                pass
+
+
+def _run_tracking_worker(tracking_queue: "queue.Queue") -> None:
+    """Run queued tracking calls until a None sentinel is received"""
+    try:
+        while True:
+            item = tracking_queue.get()
+            try:
+                if item is None:
+                    return
+                func, args = item
+                func(*args)
+            except Exception as e:
+                logger.warning("Failed to track usage: %s", e)
+            finally:
+                tracking_queue.task_done()
+    finally:
+        _tracking_workers.pop(threading.current_thread(), None)
+
+
+def _drain_tracking_workers() -> None:
+    """Let the tracking workers finish their queued calls before exit"""
+    deadline = time.monotonic() + _EXIT_DRAIN_TIMEOUT
+    for worker, tracking_queue in list(_tracking_workers.items()):
+        try:
+            tracking_queue.put(None, timeout=max(deadline - time.monotonic(), 0))
+            worker.join(max(deadline - time.monotonic(), 0))
+        except queue.Full:
+            pass
+        if worker.is_alive():
+            logger.warning(
+                "Exiting with %d usage tracking events still pending",
+                tracking_queue.qsize(),
+            )
+
+
+def _reset_tracking_after_fork() -> None:
+    """Give a forked child fresh tracking workers; threads don't survive fork"""
+    _tracking_workers.clear()
+    for tracker in list(_trackers):
+        tracker._reset_extract_worker()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_tracking_after_fork)
+
+
+# Workers are daemon threads, so they have to be drained explicitly. Hooks
+# registered with threading run before concurrent.futures shuts down its
+# executors (its hook was registered earlier, when ThreadPoolExecutor was
+# imported above), so drained events can still be sent
+if hasattr(threading, "_register_atexit"):
+    threading._register_atexit(_drain_tracking_workers)
+else:  # pragma: no cover
+    atexit.register(_drain_tracking_workers)
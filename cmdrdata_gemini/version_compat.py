@@ -4,6 +4,8 @@ Version compatibility and detection for cmdrdata-gemini
 
 import sys
 import warnings
+from functools import lru_cache
+from importlib import metadata
 from typing import Any, Dict, Optional, Tuple
 
 try:
@@ -38,6 +40,26 @@ except ImportError:
     version = type("Version", (), {"parse": parse})()
 
 
+@lru_cache(maxsize=16)
+def _parse(v: str):
+    """Parse a version string, caching the result"""
+    return version.parse(v)
+
+
+def _get_genai_version() -> Optional[str]:
+    """Return the installed Google Gen AI SDK version, or None if missing"""
+    # Use the SDK's own version if it is already imported; otherwise read
+    # the installed distribution's metadata rather than importing the SDK
+    genai = sys.modules.get("google.genai")
+    genai_version = getattr(genai, "__version__", None)
+    if genai_version:
+        return genai_version
+    try:
+        return metadata.version("google-genai")
+    except metadata.PackageNotFoundError:
+        return None
+
+
 class VersionCompatibility:
     """Handles version detection and compatibility warnings for Google Gen AI"""
 
@@ -60,34 +82,38 @@ class VersionCompatibility:
         "latest_tested": "0.13.0",
     }
 
+    # Parsed once, since every check compares against them
+    _MIN_VERSION = _parse(SUPPORTED_GENAI_VERSIONS["min"])
+    _MAX_VERSION = _parse(SUPPORTED_GENAI_VERSIONS["max"])
+    # Untested versions below this one get a warning
+    _UNTESTED_WARNING_BELOW = _parse("0.8.0")
+
     def __init__(self):
         self.genai_version = None
+        self._parsed_genai_version = None
         self._check_genai_version()
 
     def _check_genai_version(self):
         """Check installed version of Google Gen AI SDK"""
-        try:
-            import google.genai as genai
-
-            self.genai_version = genai.__version__
-            self._validate_genai_version()
-        except ImportError:
+        self.genai_version = _get_genai_version()
+        if self.genai_version is None:
             warnings.warn(
                 "Google Gen AI SDK not found. Please install it: pip install google-genai>=0.1.0",
                 UserWarning,
                 stacklevel=3,
             )
+        else:
+            self._parsed_genai_version = _parse(self.genai_version)
+            self._validate_genai_version()
 
     def _validate_genai_version(self):
         """Validate Google Gen AI version and show warnings if needed"""
         if not self.genai_version:
             return
 
-        current = version.parse(self.genai_version)
-        min_version = version.parse(self.SUPPORTED_GENAI_VERSIONS["min"])
-        max_version = version.parse(self.SUPPORTED_GENAI_VERSIONS["max"])
+        current = self._parsed_genai_version
 
-        if current < min_version:
+        if current < self._MIN_VERSION:
             warnings.warn(
                 f"cmdrdata-gemini: Google Gen AI SDK version {self.genai_version} is below minimum "
                 f"supported version {self.SUPPORTED_GENAI_VERSIONS['min']}. "
@@ -95,7 +121,7 @@ class VersionCompatibility:
                 UserWarning,
                 stacklevel=3,
             )
-        elif current >= max_version:
+        elif current >= self._MAX_VERSION:
             warnings.warn(
                 f"cmdrdata-gemini: Google Gen AI SDK version {self.genai_version} is newer than tested version. "
                 f"cmdrdata-gemini was tested up to version {self.SUPPORTED_GENAI_VERSIONS['latest_tested']}. "
@@ -105,7 +131,7 @@ class VersionCompatibility:
             )
         # Only warn for significantly older untested versions, not newer ones
         elif (
-            current < version.parse("0.8.0")
+            current < self._UNTESTED_WARNING_BELOW
             and str(current) not in self.SUPPORTED_GENAI_VERSIONS["tested"]
         ):
             warnings.warn(
@@ -121,11 +147,7 @@ class VersionCompatibility:
         if not self.genai_version:
             return False
 
-        current = version.parse(self.genai_version)
-        min_version = version.parse(self.SUPPORTED_GENAI_VERSIONS["min"])
-        max_version = version.parse(self.SUPPORTED_GENAI_VERSIONS["max"])
-
-        return min_version <= current < max_version
+        return self._MIN_VERSION <= self._parsed_genai_version < self._MAX_VERSION
 
     def get_compatibility_info(self) -> Dict[str, Any]:
         """Get comprehensive compatibility information"""
@@ -135,7 +157,7 @@ class VersionCompatibility:
                 "supported": self.is_genai_supported(),
                 "min_supported": self.SUPPORTED_GENAI_VERSIONS["min"],
                 "max_supported": self.SUPPORTED_GENAI_VERSIONS["max"],
-                "tested_versions": self.SUPPORTED_GENAI_VERSIONS["tested"],
+                "tested_versions": list(self.SUPPORTED_GENAI_VERSIONS["tested"]),
             },
             "python": {
                 "version": f"{sys.version_info[0]}.{sys.version_info[1]}.{sys.version_info[2]}",
@@ -144,8 +166,15 @@ class VersionCompatibility:
         }
 
 
-# Global instance
-_version_compat = VersionCompatibility()
+@lru_cache(maxsize=1)
+def _detect() -> VersionCompatibility:
+    """
+    Detect the environment once per process.
+
+    The installed SDK cannot change under a running process, so detection
+    (and its warnings) only happens on first use rather than at import.
+    """
+    return VersionCompatibility()
 
 
 def check_compatibility() -> bool:
@@ -155,7 +184,7 @@ def check_compatibility() -> bool:
     Returns:
         True if compatible, False otherwise
     """
-    return _version_compat.is_genai_supported()
+    return _detect().is_genai_supported()
 
 
 def get_compatibility_info() -> Dict[str, Any]:
@@ -165,4 +194,4 @@ def get_compatibility_info() -> Dict[str, Any]:
     Returns:
         Dictionary with compatibility details
     """
-    return _version_compat.get_compatibility_info()
+    return _detect().get_compatibility_info()
@@ -69,6 +69,7 @@ class TestBasicFunctionality:
                     result = client.models.generate_content(
                         model="gemini-2.5-flash", contents="Hello, Gemini!"
                     )
+                client._tracker.flush()
 
                 # Verify tracking was called with context customer ID
                 mock_track.assert_called_once()
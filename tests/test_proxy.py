@@ -2,6 +2,8 @@
 Tests for TrackedProxy and Gemini-specific tracking
 """
 
+import inspect
+import logging
 import time
 from unittest.mock import Mock, patch
 
@@ -10,6 +12,7 @@ import pytest
 from cmdrdata_gemini.proxy import (
     GEMINI_TRACK_METHODS,
     TrackedProxy,
+    _compile_track_methods,
     track_batch_embed_contents,
     track_batch_generate_content,
     track_classify_text,
@@ -20,6 +23,19 @@ from cmdrdata_gemini.proxy import (
 )
 
 
+def tracked_call_arguments(call):
+    """Map a positional tracking-function call onto its parameter names"""
+    signature = inspect.signature(track_generate_content)
+    return signature.bind(*call[0], **call[1]).arguments
+
+
+def inline_tracker():
+    """Mock tracker that runs submitted tracking calls synchronously"""
+    tracker = Mock()
+    tracker.submit_tracking.side_effect = lambda func, *args: func(*args)
+    return tracker
+
+
 class TestTrackedProxy:
     def test_proxy_forwards_attributes(self):
         """Test that proxy forwards attribute access to underlying client"""
@@ -47,7 +63,7 @@ class TestTrackedProxy:
         """Test that proxy wraps methods that should be tracked"""
         mock_client = Mock()
         mock_client.tracked_method.return_value = "result"
-        mock_tracker = Mock()
+        mock_tracker = inline_tracker()
         mock_track_func = Mock()
 
         track_methods = {"tracked_method": mock_track_func}
@@ -68,7 +84,7 @@ class TestTrackedProxy:
         mock_models = Mock()
         mock_models.generate_content.return_value = "result"
         mock_client.models = mock_models
-        mock_tracker = Mock()
+        mock_tracker = inline_tracker()
         mock_track_func = Mock()
 
         track_methods = {"models.generate_content": mock_track_func}
@@ -88,11 +104,107 @@ class TestTrackedProxy:
         mock_track_func.assert_called_once()
         assert result == "result"
 
+    def test_proxy_prewraps_tracked_attributes(self):
+        """Test that tracked methods and sub-proxies are built once at init"""
+        mock_client = Mock()
+        mock_tracker = inline_tracker()
+        mock_track_func = Mock()
+
+        track_methods = {
+            "tracked_method": mock_track_func,
+            "models.generate_content": mock_track_func,
+        }
+        proxy = TrackedProxy(mock_client, mock_tracker, track_methods)
+
+        assert isinstance(proxy.models, TrackedProxy)
+        assert proxy.models is proxy.models
+        assert proxy.tracked_method is proxy.tracked_method
+        assert proxy.models.generate_content is proxy.models.generate_content
+
+    def test_proxy_has_no_instance_dict(self):
+        """Test that proxies store their state in slots rather than a __dict__"""
+        proxy = TrackedProxy(Mock(), Mock(), {"models.generate_content": Mock()})
+
+        # hasattr(proxy, "__dict__") would be forwarded to the client
+        assert type(proxy).__dictoffset__ == 0
+        assert type(proxy.models).__dictoffset__ == 0
+
+    def test_proxy_class_specialised_per_shape(self):
+        """Test that proxies with the same tracked names share a generated class"""
+        mock_tracker = inline_tracker()
+        track_methods = {"models.generate_content": Mock(), "tracked_method": Mock()}
+
+        proxy_a = TrackedProxy(Mock(), mock_tracker, track_methods)
+        proxy_b = TrackedProxy(Mock(), mock_tracker, track_methods)
+        plain = TrackedProxy(Mock(), mock_tracker, {})
+
+        assert isinstance(proxy_a, TrackedProxy)
+        assert type(proxy_a) is not TrackedProxy
+        assert type(proxy_a) is type(proxy_b)
+        assert set(type(proxy_a).__slots__) == {"models", "tracked_method"}
+        assert type(plain) is TrackedProxy
+
+    def test_proxy_accepts_non_identifier_names(self):
+        """Test that tracked names which can't be slots still get wrapped"""
+        mock_client = Mock()
+        mock_tracker = inline_tracker()
+        mock_track_func = Mock()
+
+        proxy = TrackedProxy(
+            mock_client, mock_tracker, {"models-v2.generate": mock_track_func}
+        )
+        getattr(proxy, "models-v2").generate()
+
+        assert isinstance(getattr(proxy, "models-v2"), TrackedProxy)
+        mock_track_func.assert_called_once()
+
+    def test_proxy_rejects_reserved_names(self):
+        """Test that tracked names can't overwrite the proxy's own state"""
+        for name in ("_client", "_tracker", "_wrap_method"):
+            with pytest.raises(ValueError, match=name):
+                TrackedProxy(Mock(), Mock(), {name: Mock()})
+
+    def test_proxy_preserves_wrapped_signature(self):
+        """Test that tracked methods report the underlying method's signature"""
+
+        class Models:
+            def generate_content(self, *, model, contents, config=None):
+                """Generate content"""
+
+        proxy = TrackedProxy(Models(), Mock(), {"generate_content": Mock()})
+
+        assert proxy.generate_content.__name__ == "generate_content"
+        assert proxy.generate_content.__doc__ == "Generate content"
+        assert str(inspect.signature(proxy.generate_content)) == (
+            "(*, model, contents, config=None)"
+        )
+
+    def test_compile_track_methods(self):
+        """Test that dotted method paths are parsed into a nested tree"""
+        generate, count, top = Mock(), Mock(), Mock()
+
+        tree = _compile_track_methods(
+            {
+                "models.generate_content": generate,
+                "models.count_tokens": count,
+                "top_level": top,
+            }
+        )
+
+        assert tree == {
+            "models": {"generate_content": generate, "count_tokens": count},
+            "top_level": top,
+        }
+        # Already-nested subtrees are accepted as-is
+        assert _compile_track_methods(tree) == tree
+        with pytest.raises(TypeError):
+            tree["models"]["count_tokens"] = None
+
     def test_proxy_customer_id_extraction(self):
         """Test that proxy extracts customer_id from kwargs"""
         mock_client = Mock()
         mock_client.tracked_method.return_value = "result"
-        mock_tracker = Mock()
+        mock_tracker = inline_tracker()
         mock_track_func = Mock()
 
         track_methods = {"tracked_method": mock_track_func}
@@ -105,14 +217,28 @@ class TestTrackedProxy:
 
         # Verify tracking function received customer_id
         mock_track_func.assert_called_once()
-        call_kwargs = mock_track_func.call_args[1]
+        call_kwargs = tracked_call_arguments(mock_track_func.call_args)
         assert call_kwargs["customer_id"] == "customer-123"
 
+    def test_proxy_passes_model_to_tracker(self):
+        """Test that the requested model is handed to the tracker directly"""
+        mock_client = Mock()
+        mock_tracker = inline_tracker()
+        mock_track_func = Mock()
+
+        proxy = TrackedProxy(
+            mock_client, mock_tracker, {"tracked_method": mock_track_func}
+        )
+        proxy.tracked_method(model="models/gemini-2.5-flash")
+
+        call_kwargs = tracked_call_arguments(mock_track_func.call_args)
+        assert call_kwargs["raw_model"] == "models/gemini-2.5-flash"
+
     def test_proxy_tracking_disabled(self):
         """Test that proxy respects track_usage=False"""
         mock_client = Mock()
         mock_client.tracked_method.return_value = "result"
-        mock_tracker = Mock()
+        mock_tracker = inline_tracker()
         mock_track_func = Mock()
 
         track_methods = {"tracked_method": mock_track_func}
@@ -130,7 +256,7 @@ class TestTrackedProxy:
         """Test that proxy continues if tracking fails"""
         mock_client = Mock()
         mock_client.tracked_method.return_value = "result"
-        mock_tracker = Mock()
+        mock_tracker = inline_tracker()
         mock_track_func = Mock(side_effect=Exception("Tracking failed"))
 
         track_methods = {"tracked_method": mock_track_func}
@@ -143,6 +269,86 @@ class TestTrackedProxy:
         mock_client.tracked_method.assert_called_once_with("arg1", kwarg="value")
         assert result == "result"
 
+    def test_proxy_tracking_failure_logged_lazily(self, caplog):
+        """Test that tracking failures are logged with deferred formatting"""
+        mock_client = Mock()
+        mock_tracker = Mock()
+        error = Exception("Queue unavailable")
+        mock_tracker.submit_tracking.side_effect = error
+
+        proxy = TrackedProxy(mock_client, mock_tracker, {"tracked_method": Mock()})
+
+        with caplog.at_level(logging.WARNING, logger="cmdrdata_gemini.proxy"):
+            proxy.tracked_method()
+
+        (record,) = caplog.records
+        assert record.msg == "Failed to track usage for %s: %s"
+        assert record.args == ("tracked_method", error)
+        assert record.getMessage() == (
+            "Failed to track usage for tracked_method: Queue unavailable"
+        )
+
+    def test_proxy_snapshots_list_arguments(self):
+        """Test that deferred tracking sees list arguments as they were passed"""
+        mock_client = Mock()
+        mock_client.models.batch_embed_contents.return_value = Mock(embeddings=[])
+        mock_tracker = Mock()  # Holds submitted tracking calls without running them
+
+        proxy = TrackedProxy(mock_client, mock_tracker, GEMINI_TRACK_METHODS)
+        requests = [{"content": "Hello"}, {"content": "World"}]
+        proxy.models.batch_embed_contents(
+            model="text-embedding-004", requests=requests, customer_id="customer-1"
+        )
+        requests.clear()  # Caller reuses its list before tracking runs
+
+        track_func, *args = mock_tracker.submit_tracking.call_args[0]
+        track_func(*args)
+
+        call_kwargs = mock_tracker.track_usage_background.call_args[1]
+        assert call_kwargs["metadata"]["batch_size"] == 2
+        assert call_kwargs["metadata"]["total_content_length"] == 10
+
+    def test_proxy_snapshots_custom_metadata(self):
+        """Test that deferred tracking sees the metadata each call was made with"""
+        mock_client = Mock()
+        mock_tracker = Mock()  # Holds submitted tracking calls without running them
+        mock_track_func = Mock()
+
+        proxy = TrackedProxy(
+            mock_client, mock_tracker, {"tracked_method": mock_track_func}
+        )
+        metadata = {}
+        for i in range(3):
+            metadata["i"] = i  # Caller reuses one dict for every call
+            proxy.tracked_method(metadata=metadata)
+
+        for i, call in enumerate(mock_tracker.submit_tracking.call_args_list):
+            track_func, *args = call[0]
+            track_func(*args)
+            call_kwargs = tracked_call_arguments(mock_track_func.call_args)
+            assert call_kwargs["custom_metadata"] == {"i": i}
+
+    def test_proxy_request_ids_are_unique(self):
+        """Test that each tracked call gets a distinct request ID"""
+        mock_client = Mock()
+        mock_tracker = inline_tracker()
+        mock_track_func = Mock()
+
+        proxy = TrackedProxy(
+            mock_client, mock_tracker, {"tracked_method": mock_track_func}
+        )
+
+        for _ in range(3):
+            proxy.tracked_method()
+
+        request_ids = [
+            tracked_call_arguments(c)["request_id"]
+            for c in mock_track_func.call_args_list
+        ]
+        assert len(set(request_ids)) == 3
+        # All IDs from one process share the same random prefix
+        assert len({request_id[:16] for request_id in request_ids}) == 1
+
     def test_proxy_tracks_api_error(self):
         """Test that the proxy tracks an error if the API call fails"""
         mock_client = Mock()
@@ -150,7 +356,7 @@ class TestTrackedProxy:
         api_error = Exception("API call failed")
         mock_client.tracked_method.side_effect = api_error
 
-        mock_tracker = Mock()
+        mock_tracker = inline_tracker()
         mock_track_func = Mock()
 
         track_methods = {"tracked_method": mock_track_func}
@@ -162,7 +368,7 @@ class TestTrackedProxy:
 
         # Verify that the tracking function was still called with error details
         mock_track_func.assert_called_once()
-        call_kwargs = mock_track_func.call_args[1]
+        call_kwargs = tracked_call_arguments(mock_track_func.call_args)
 
         assert call_kwargs["result"] is None
         assert call_kwargs["error_occurred"] is True
@@ -171,6 +377,82 @@ class TestTrackedProxy:
         assert call_kwargs["request_start_time"] is not None
         assert call_kwargs["request_end_time"] is not None
 
+    def test_proxy_tracks_grpc_error_code(self):
+        """Test that gRPC-style errors report their code() as the error code"""
+
+        class GrpcError(Exception):
+            def code(self):
+                return "NOT_FOUND"
+
+        mock_client = Mock()
+        mock_client.tracked_method.side_effect = GrpcError("Model not found")
+        mock_tracker = inline_tracker()
+        mock_track_func = Mock()
+
+        proxy = TrackedProxy(
+            mock_client, mock_tracker, {"tracked_method": mock_track_func}
+        )
+
+        with pytest.raises(GrpcError):
+            proxy.tracked_method()
+
+        call_kwargs = tracked_call_arguments(mock_track_func.call_args)
+        assert call_kwargs["error_type"] == "grpc_error"
+        assert call_kwargs["error_code"] == "NOT_FOUND"
+
+    def test_proxy_tracks_status_code_attribute(self):
+        """Test that errors with a plain code attribute re-raise the original error"""
+
+        class APIError(Exception):
+            def __init__(self, code):
+                super().__init__(f"{code} NOT_FOUND")
+                self.code = code
+
+        mock_client = Mock()
+        mock_client.tracked_method.side_effect = APIError(404)
+        mock_tracker = inline_tracker()
+        mock_track_func = Mock()
+
+        proxy = TrackedProxy(
+            mock_client, mock_tracker, {"tracked_method": mock_track_func}
+        )
+
+        with pytest.raises(APIError):
+            proxy.tracked_method()
+
+        call_kwargs = tracked_call_arguments(mock_track_func.call_args)
+        assert call_kwargs["error_type"] == "sdk_error"
+        assert call_kwargs["error_code"] == "404"
+
+    def test_proxy_tracks_code_after_error_without_code(self):
+        """Test that an error whose code is None doesn't hide later codes"""
+
+        class ServerError(Exception):
+            def __init__(self, code=None):
+                super().__init__(f"{code} UNAVAILABLE")
+                self.code = code
+
+        mock_client = Mock()
+        mock_tracker = inline_tracker()
+        mock_track_func = Mock()
+
+        proxy = TrackedProxy(
+            mock_client, mock_tracker, {"tracked_method": mock_track_func}
+        )
+
+        mock_client.tracked_method.side_effect = ServerError()
+        with pytest.raises(ServerError):
+            proxy.tracked_method()
+        call_kwargs = tracked_call_arguments(mock_track_func.call_args)
+        assert call_kwargs["error_code"] is None
+
+        mock_client.tracked_method.side_effect = ServerError(503)
+        with pytest.raises(ServerError):
+            proxy.tracked_method()
+        call_kwargs = tracked_call_arguments(mock_track_func.call_args)
+        assert call_kwargs["error_type"] == "sdk_error"
+        assert call_kwargs["error_code"] == "503"
+
     def test_proxy_attribute_error(self):
         """Test that proxy raises AttributeError for non-existent attributes"""
         mock_client = Mock()
@@ -193,6 +475,26 @@ class TestTrackedProxy:
         dir_result = dir(proxy)
         assert "client_attr" in dir_result
 
+    def test_proxy_dir_cached_per_client(self):
+        """Test that __dir__ is computed once and rebuilt for a new client"""
+
+        class Client:
+            dir_calls = 0
+
+            def __dir__(self):
+                Client.dir_calls += 1
+                return ["client_attr"]
+
+        proxy = TrackedProxy(Client(), Mock(), {})
+
+        assert "client_attr" in dir(proxy)
+        assert "client_attr" in dir(proxy)
+        assert Client.dir_calls == 1
+
+        proxy._client = Client()
+        dir(proxy)
+        assert Client.dir_calls == 2
+
     def test_proxy_repr(self):
         """Test proxy string representation"""
         mock_client = Mock()
@@ -287,6 +589,29 @@ class TestGeminiTrackingMethods:
         # Verify tracking was not called
         mock_tracker.track_usage_background.assert_not_called()
 
+    def test_track_generate_content_missing_token_counts(self):
+        """Test that unset token counts are tracked as zero"""
+        mock_response = Mock()
+        mock_response.usage_metadata = Mock(
+            prompt_token_count=None, candidates_token_count=None
+        )
+        mock_response.candidates = []
+        mock_tracker = Mock()
+
+        track_generate_content(
+            result=mock_response,
+            customer_id="customer-123",
+            tracker=mock_tracker,
+            method_name="models.generate_content",
+            args=(),
+            kwargs={"model": "gemini-2.5-flash"},
+        )
+
+        call_args = mock_tracker.track_usage_background.call_args[1]
+        assert call_args["input_tokens"] == 0
+        assert call_args["output_tokens"] == 0
+        assert call_args["metadata"]["finish_reason"] is None
+
     def test_track_generate_content_extraction_failure(self):
         """Test graceful handling of data extraction failure"""
         mock_response = Mock()
@@ -372,6 +697,28 @@ class TestGeminiTrackingMethods:
         assert call_args["metadata"]["operation"] == "count_tokens"
         assert call_args["metadata"]["total_tokens"] == 15
 
+    def test_track_count_tokens_without_total(self):
+        """Test count_tokens tracking when the response has no token total"""
+        mock_response = Mock()
+        del mock_response.total_tokens
+        mock_tracker = Mock()
+
+        for custom_metadata in (None, {"team": "search"}):
+            track_count_tokens(
+                result=mock_response,
+                customer_id="customer-123",
+                tracker=mock_tracker,
+                method_name="models.count_tokens",
+                args=(),
+                kwargs={"model": "gemini-2.5-flash"},
+                custom_metadata=custom_metadata,
+            )
+
+        first, second = mock_tracker.track_usage_background.call_args_list
+        assert first[1]["input_tokens"] == 0
+        assert dict(first[1]["metadata"]) == {"operation": "count_tokens"}
+        assert second[1]["metadata"] == {"operation": "count_tokens", "team": "search"}
+
     def test_track_count_tokens_no_customer_id(self, mock_count_tokens_response):
         """Test count_tokens tracking without customer ID"""
         mock_tracker = Mock()
@@ -607,28 +954,32 @@ class TestGeminiTrackingMethods:
     def test_gemini_track_methods_configuration(self):
         """Test that GEMINI_TRACK_METHODS is configured correctly"""
         expected_methods = {
-            "models.generate_content": track_generate_content,
-            "models.batch_generate_content": track_batch_generate_content,
-            "models.embed_content": track_embed_content,
-            "models.batch_embed_contents": track_batch_embed_contents,
-            "models.classify_text": track_classify_text,
-            "models.start_chat": track_start_chat,
-            "models.count_tokens": track_count_tokens,
+            "generate_content": track_generate_content,
+            "batch_generate_content": track_batch_generate_content,
+            "embed_content": track_embed_content,
+            "batch_embed_contents": track_batch_embed_contents,
+            "classify_text": track_classify_text,
+            "start_chat": track_start_chat,
+            "count_tokens": track_count_tokens,
         }
 
-        for method_name, expected_function in expected_methods.items():
-            assert method_name in GEMINI_TRACK_METHODS, f"Missing method: {method_name}"
-            assert callable(
-                GEMINI_TRACK_METHODS[method_name]
-            ), f"Method {method_name} not callable"
-            assert (
-                GEMINI_TRACK_METHODS[method_name] == expected_function
-            ), f"Wrong function for {method_name}"
+        assert list(GEMINI_TRACK_METHODS) == ["models"]
+        models_methods = GEMINI_TRACK_METHODS["models"]
+        assert dict(models_methods) == expected_methods
+
+        # The configuration is shared by every client, so it is read-only
+        with pytest.raises(TypeError):
+            GEMINI_TRACK_METHODS["files"] = {}
+        with pytest.raises(TypeError):
+            models_methods["generate_content"] = None
+
+    def test_gemini_track_methods_accept_positional_call(self):
+        """Test that every tracking function accepts the proxy's positional call"""
+        expected = list(inspect.signature(track_generate_content).parameters)
 
-        # Verify we have the expected total count
-        assert (
-            len(GEMINI_TRACK_METHODS) == 7
-        ), f"Expected 7 methods, got {len(GEMINI_TRACK_METHODS)}"
+        for method_name, track_func in GEMINI_TRACK_METHODS["models"].items():
+            parameters = list(inspect.signature(track_func).parameters)
+            assert parameters == expected, f"Parameter mismatch for {method_name}"
 
     def test_proxy_integration_all_methods(self):
         """Test that all tracking methods work through proxy integration"""
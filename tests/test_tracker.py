@@ -3,6 +3,11 @@ Unit tests for UsageTracker
 """
 
 import asyncio
+import os
+import subprocess
+import sys
+import textwrap
+import threading
 import time
 from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
@@ -388,6 +393,129 @@ class TestUsageTracker:
             # Verify the first argument is the track_usage method
             assert mock_submit.call_args[0][0] == tracker.track_usage
 
+    def test_submit_tracking_runs_on_worker_thread(self):
+        """Test that submitted tracking calls run off the caller's thread"""
+        tracker = UsageTracker(api_key=self.valid_api_key)
+        calls = []
+
+        def track(*args):
+            calls.append((args, threading.current_thread().name))
+
+        tracker.submit_tracking(track, "a", 1)
+        tracker.flush()
+
+        assert calls == [(("a", 1), "cmdrdata-tracking")]
+
+    def test_submit_tracking_swallows_errors(self):
+        """Test that a failing tracking call does not stop the worker"""
+        tracker = UsageTracker(api_key=self.valid_api_key)
+        failing = Mock(side_effect=Exception("Extraction failed"))
+        succeeding = Mock()
+
+        tracker.submit_tracking(failing)
+        tracker.submit_tracking(succeeding, "ok")
+        tracker.flush()
+
+        failing.assert_called_once_with()
+        succeeding.assert_called_once_with("ok")
+
+    def test_submit_tracking_drops_when_queue_full(self):
+        """Test that submissions never block when the queue is full"""
+        tracker = UsageTracker(api_key=self.valid_api_key, max_pending_events=1)
+        tracker._extract_worker = Mock()  # Keep the queue from draining
+        track = Mock()
+
+        tracker.submit_tracking(track, 1)
+        tracker.submit_tracking(track, 2)
+
+        assert tracker._extract_queue.qsize() == 1
+        track.assert_not_called()
+
+    def test_submit_tracking_logs_drops_once(self):
+        """Test that a run of dropped events logs once, not once per event"""
+        tracker = UsageTracker(api_key=self.valid_api_key, max_pending_events=1)
+        tracker._extract_worker = Mock()  # Keep the queue from draining
+        track = Mock()
+
+        with patch("cmdrdata_gemini.tracker.logger") as mock_logger:
+            for i in range(5):
+                tracker.submit_tracking(track, i)
+            mock_logger.warning.assert_called_once()
+
+            tracker._extract_queue.get_nowait()
+            tracker.submit_tracking(track, 5)
+
+        assert mock_logger.warning.call_count == 2
+        assert mock_logger.warning.call_args[0][1] == 4
+
+    @pytest.mark.skipif(not hasattr(os, "fork"), reason="requires os.fork")
+    def test_submit_tracking_after_fork(self):
+        """Test that a forked child starts its own tracking worker"""
+        tracker = UsageTracker(api_key=self.valid_api_key)
+        tracker.submit_tracking(Mock())
+        tracker.flush()  # The parent's worker is now running
+
+        pid = os.fork()
+        if pid == 0:
+            # Child: only report success through the exit status
+            ran = threading.Event()
+            try:
+                tracker.submit_tracking(ran.set)
+                os._exit(0 if ran.wait(5) else 1)
+            finally:
+                os._exit(2)
+
+        _, status = os.waitpid(pid, 0)
+        assert os.WEXITSTATUS(status) == 0
+
+    def test_pending_tracking_delivered_at_exit(self):
+        """Test that tracking calls queued just before exit are still sent"""
+        script = textwrap.dedent("""
+            import atexit
+            from types import SimpleNamespace
+
+            from cmdrdata_gemini.proxy import GEMINI_TRACK_METHODS, TrackedProxy
+            from cmdrdata_gemini.tracker import UsageTracker
+
+            delivered = []
+
+
+            class RecordingTracker(UsageTracker):
+                def track_usage(self, *args, **kwargs):
+                    delivered.append(args)
+                    return True
+
+
+            # Plain atexit hooks run after threads and executors are shut down
+            atexit.register(lambda: print("delivered", len(delivered)))
+
+            usage = SimpleNamespace(
+                prompt_token_count=3, candidates_token_count=5, total_token_count=8
+            )
+            result = SimpleNamespace(usage_metadata=usage, candidates=[])
+            client = SimpleNamespace(
+                models=SimpleNamespace(generate_content=lambda **kwargs: result)
+            )
+            tracker = RecordingTracker(api_key="tk-" + "a" * 32)
+            proxy = TrackedProxy(client, tracker, GEMINI_TRACK_METHODS)
+
+            for _ in range(300):
+                proxy.models.generate_content(
+                    model="gemini-2.5-flash", contents="Hello", customer_id="c-1"
+                )
+            """)
+
+        completed = subprocess.run(
+            [sys.executable, "-c", script],
+            capture_output=True,
+            text=True,
+            timeout=60,
+        )
+
+        assert completed.returncode == 0, completed.stderr
+        # Library log records share stdout, the count is printed last
+        assert completed.stdout.splitlines()[-1] == "delivered 300"
+
     def test_get_health_status(self):
         """Test health status method"""
         tracker = UsageTracker(
@@ -2,18 +2,38 @@
 Tests for Google Gen AI version compatibility detection
 """
 
+import json
 import sys
+import types
 import warnings
-from unittest.mock import Mock, patch
+from importlib.metadata import PackageNotFoundError
+from unittest.mock import patch
 
 import pytest
 
+from cmdrdata_gemini import version_compat
 from cmdrdata_gemini.version_compat import (
     VersionCompatibility,
+    _detect,
+    _parse,
     check_compatibility,
     get_compatibility_info,
 )
 
+# Report every compatibility warning, however often the same line warns.
+# pytest installs this filter in its own per-test warnings capture
+pytestmark = pytest.mark.filterwarnings("always")
+
+
+@pytest.fixture(autouse=True)
+def _fresh_detection():
+    """Make every test run its own environment detection and version parsing"""
+    _detect.cache_clear()
+    _parse.cache_clear()
+    yield
+    _detect.cache_clear()
+    _parse.cache_clear()
+
 
 class TestVersionCompatibility:
     def test_genai_version_detection(self):
@@ -23,93 +43,82 @@ class TestVersionCompatibility:
         # Should detect some version (or warn if not installed)
         assert compat.genai_version is not None or len(warnings.filters) > 0
 
-    def test_supported_genai_version(self):
-        """Test that supported versions are marked as compatible"""
-        with patch("cmdrdata_gemini.version_compat.version") as mock_version:
-            # Mock a supported version (0.5.0 is between 0.1.0 and 1.0.0)
-            mock_parse = Mock()
-            mock_current = Mock()
-            mock_min = Mock()
-            mock_max = Mock()
-
-            # Set up comparison results for 0.5.0 being between 0.1.0 and 1.0.0
-            mock_current.__le__ = Mock(return_value=True)  # 0.5.0 <= 0.5.0
-            mock_current.__lt__ = Mock(return_value=True)  # 0.5.0 < 1.0.0
-            mock_min.__le__ = Mock(return_value=True)  # 0.1.0 <= 0.5.0
-            mock_max.__lt__ = Mock(return_value=False)  # 1.0.0 < 0.5.0 (False)
-
-            def parse_side_effect(v):
-                if v == "0.5.0":
-                    return mock_current
-                elif v == "0.1.0":
-                    return mock_min
-                elif v == "1.0.0":
-                    return mock_max
-                return Mock()
-
-            mock_parse.side_effect = parse_side_effect
-            mock_version.parse = mock_parse
-
+    @pytest.mark.parametrize(
+        "ver,supported,expect_warn_substr",
+        [
+            ("0.5.0", True, None),
+            ("0.1.0", True, None),
+            ("0.6.0", True, "not been fully tested"),
+            ("0.0.1", False, "below minimum"),
+            ("1.0.0", False, "newer than tested"),
+            ("1.2.0", False, "newer than tested"),
+        ],
+    )
+    def test_genai_version_support(
+        self, monkeypatch, ver, supported, expect_warn_substr
+    ):
+        """Test support and warnings across the supported version range"""
+        monkeypatch.setattr(
+            "cmdrdata_gemini.version_compat._get_genai_version", lambda: ver
+        )
+
+        with warnings.catch_warnings(record=True) as w:
+            compat = VersionCompatibility()
+
+        assert compat.is_genai_supported() is supported
+        if expect_warn_substr is None:
+            assert not w
+        else:
+            assert len(w) == 1
+            assert expect_warn_substr in str(w[0].message)
+
+    def test_installed_version_parsed_once(self):
+        """Test that detection and support checks share one parsed version"""
+        with patch(
+            "cmdrdata_gemini.version_compat.version.parse",
+            wraps=version_compat.version.parse,
+        ) as mock_parse:
             with patch("google.genai.__version__", "0.5.0"):
                 compat = VersionCompatibility()
                 assert compat.is_genai_supported()
+                assert compat.is_genai_supported()
+
+        mock_parse.assert_called_once_with("0.5.0")
 
-    def test_unsupported_genai_version(self):
-        """Test handling of unsupported Google Gen AI versions"""
-        with patch("cmdrdata_gemini.version_compat.version") as mock_version:
-            # Mock an unsupported (too old) version
-            mock_parse = Mock()
-            mock_old_version = Mock()
-            mock_old_version.__lt__ = Mock(return_value=True)
-            mock_old_version.__ge__ = Mock(return_value=False)
-            mock_parse.return_value = mock_old_version
-            mock_version.parse = mock_parse
-
-            with patch("google.genai.__version__", "0.0.1"):
+    def test_genai_version_from_metadata(self):
+        """Test that the version is read from metadata without importing the SDK"""
+        with patch.dict(sys.modules, {"google.genai": None}):
+            with patch(
+                "importlib.metadata.version", return_value="0.5.0"
+            ) as mock_version:
+                compat = VersionCompatibility()
+
+        mock_version.assert_called_once_with("google-genai")
+        assert compat.genai_version == "0.5.0"
+        assert compat.is_genai_supported()
+
+    def test_genai_version_from_metadata_when_module_unversioned(self):
+        """Test that an imported SDK without __version__ isn't reported missing"""
+        with patch.dict(sys.modules, {"google.genai": types.ModuleType("genai")}):
+            with patch("importlib.metadata.version", return_value="0.5.0"):
                 with warnings.catch_warnings(record=True) as w:
-                    warnings.simplefilter("always")
                     compat = VersionCompatibility()
-                    assert not compat.is_genai_supported()
-                    assert len(w) > 0
-                    assert "below minimum" in str(w[0].message)
+
+        assert compat.genai_version == "0.5.0"
+        assert not w
 
     def test_missing_genai(self):
         """Test handling when Google Gen AI SDK is not installed"""
-        import builtins
-
-        original_import = builtins.__import__
-
-        def mock_import(name, *args, **kwargs):
-            if name == "google.genai":
-                raise ImportError("No module named 'google.genai'")
-            return original_import(name, *args, **kwargs)
-
-        with patch("builtins.__import__", side_effect=mock_import):
-            with warnings.catch_warnings(record=True) as w:
-                warnings.simplefilter("always")
-                compat = VersionCompatibility()
-                assert not compat.is_genai_supported()
-                assert len(w) > 0
-                assert "not found" in str(w[0].message)
-
-    def test_version_warnings(self):
-        """Test version compatibility warnings"""
-        with patch("cmdrdata_gemini.version_compat.version") as mock_version:
-            # Mock a newer untested version
-            mock_parse = Mock()
-            mock_new_version = Mock()
-            mock_new_version.__lt__ = Mock(return_value=False)
-            mock_new_version.__ge__ = Mock(return_value=True)
-            mock_new_version.__str__ = Mock(return_value="0.99.0")
-            mock_parse.return_value = mock_new_version
-            mock_version.parse = mock_parse
-
-            with patch("google.genai.__version__", "0.99.0"):
+        with patch.dict(sys.modules, {"google.genai": None}):
+            with patch(
+                "importlib.metadata.version",
+                side_effect=PackageNotFoundError("google-genai"),
+            ):
                 with warnings.catch_warnings(record=True) as w:
-                    warnings.simplefilter("always")
                     compat = VersionCompatibility()
+                    assert not compat.is_genai_supported()
                     assert len(w) > 0
-                    assert "newer than tested" in str(w[0].message)
+                    assert "not found" in str(w[0].message)
 
     def test_get_compatibility_info(self):
         """Test compatibility information retrieval"""
@@ -120,7 +129,37 @@ class TestVersionCompatibility:
         assert "version" in info["python"]
         assert info["python"]["supported"] == (sys.version_info >= (3, 9))
 
+    def test_get_compatibility_info_cached(self):
+        """Test that repeated calls reuse detection but return independent dicts"""
+        info = get_compatibility_info()
+        again = get_compatibility_info()
+
+        assert again == info
+        assert again is not info
+        assert isinstance(info["google_genai"]["tested_versions"], list)
+        info["python"]["supported"] = None
+        assert get_compatibility_info()["python"]["supported"] is not None
+
+    def test_get_compatibility_info_json_round_trip(self):
+        """Test that compatibility information can be serialized as JSON"""
+        info = get_compatibility_info()
+
+        assert json.loads(json.dumps(info)) == info
+
     def test_check_compatibility_function(self):
         """Test standalone compatibility check function"""
         result = check_compatibility()
         assert isinstance(result, bool)
+
+    def test_detection_cached(self):
+        """Test that the module-level helpers share one detection"""
+        with patch(
+            "cmdrdata_gemini.version_compat.VersionCompatibility",
+            wraps=VersionCompatibility,
+        ) as mock_compat:
+            check_compatibility()
+            get_compatibility_info()
+            check_compatibility()
+
+        mock_compat.assert_called_once_with()
+        assert _detect() is _detect()